@@ -1,20 +1,24 @@
 import os
 import time
 import datetime
+import functools
+import gzip
 import hashlib
+import importlib
 import json
+import math
+import threading
 from collections import defaultdict
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, Response, render_template, jsonify, request, session
 from flask_cors import CORS
 import requests
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-import feedparser
+import heapq
+from lxml import etree
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+# numpy, scikit-learn, BeautifulSoup and feedparser are imported where they are
+# used (and preloaded by warm_up) so the server starts without paying for them
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -61,6 +65,17 @@ NEWS_SOURCES = {
     },
 }
 
+# Position of each source in NEWS_SOURCES; when several sources carry the same
+# article, the earliest one owns it
+SOURCE_RANK = {
+    source_key: rank
+    for rank, source_key in enumerate(key for sources in NEWS_SOURCES.values() for key in sources)
+}
+
+# Latest successful fetch per source_key behind the current snapshot:
+# {"articles": [...], "fetched_at": timestamp}
+LATEST_FEEDS = {}
+
 # Enhanced cache
 CACHE = {
     "all_articles": [],
@@ -71,11 +86,72 @@ CACHE = {
     "clusters": [],
     "sentiment": {},
     "fetched_at": 0,
+    "version": 0,
     "stats": {},
     "failed_sources": []
 }
 CACHE_TTL = 300
 
+# Startup: the HTTP server comes up immediately while heavy modules are
+# preloaded and the first fetch runs in the background
+ASYNC_BOOT = os.environ.get("ASYNC_BOOT", "1") == "1"
+WARMUP_MODULES = ["bs4", "feedparser", "numpy", "sklearn.feature_extraction.text", "sklearn.metrics.pairwise"]
+BOOT = {
+    "started_at": time.time(),
+    "started": False,
+    "warm": False,
+    "initial_fetch": "pending",
+    "failed_at": 0
+}
+BOOT_LOCK = threading.Lock()
+# Seconds to wait before retrying an initial fetch that failed
+BOOT_RETRY_INTERVAL = 30
+
+# Progressive publishing: merge each feed into the live snapshot as soon as it
+# finishes; feeds still running at the deadline are left for the next refresh
+PROGRESSIVE_PUBLISH = os.environ.get("PROGRESSIVE_PUBLISH", "1") == "1"
+REFRESH_DEADLINE = int(os.environ.get("REFRESH_DEADLINE", 25))
+# A source that keeps missing the deadline keeps its previous articles for at
+# most this many seconds
+STRAGGLER_MAX_AGE = int(os.environ.get("STRAGGLER_MAX_AGE", 3 * 300))
+# Sources whose fetch is still running, possibly from an earlier refresh
+FETCHING_SOURCES = set()
+FETCHING_LOCK = threading.Lock()
+
+# Admission control for the expensive endpoints: (tokens per second, burst)
+# per client, and shared by all clients of an endpoint
+CLIENT_RATE_LIMITS = {
+    "refresh": (1 / 30, 2),
+    "search": (2, 10),
+}
+ENDPOINT_RATE_LIMITS = {
+    "refresh": (1 / 10, 3),
+    "search": (50, 100),
+}
+TRUST_PROXY = os.environ.get("TRUST_PROXY", "0") == "1"
+# A refresh joins the one in flight; beyond this many waiters it is shed
+REFRESH_MAX_WAITERS = int(os.environ.get("REFRESH_MAX_WAITERS", 8))
+# Snapshots younger than this are returned as-is by /api/refresh
+REFRESH_MIN_INTERVAL = int(os.environ.get("REFRESH_MIN_INTERVAL", 30))
+SEARCH_DEFAULT_PER_PAGE = 50
+SEARCH_MAX_PER_PAGE = 100
+
+TRENDING_LIMIT = 30
+# Categories shown on the front page
+FRONT_CATEGORIES = ('World', 'Politics')
+
+# Streaming feed parsing: entries are read incrementally from the socket and
+# parsing stops as soon as we have enough (or reach an article we already have)
+STREAMING_PARSE = os.environ.get("STREAMING_PARSE", "1") == "1"
+FEED_MAX_BYTES = int(os.environ.get("FEED_MAX_BYTES", 5 * 1024 * 1024))
+FEED_MAX_ENTRIES = int(os.environ.get("FEED_MAX_ENTRIES", 100))
+FEED_MAX_FIELD_CHARS = 20000
+FEED_CHUNK_SIZE = 16 * 1024
+MEDIA_NS = "http://search.yahoo.com/mrss/"
+# Articles from the previous fetch of each source (newest first) and whether that
+# fetch read the whole feed; reused when the stream reaches a known article
+FEED_STATE = {}
+
 def analyze_sentiment(text):
     """Enhanced sentiment analysis"""
     positive_words = ['breakthrough', 'success', 'growth', 'innovation', 'win', 'achievement', 'record', 'profit', 'gain', 'improve', 'advance', 'positive', 'excellent', 'outstanding']
@@ -97,6 +173,10 @@ def cluster_similar_articles(articles, n_clusters=5):
         return []
     
     try:
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
         texts = [f"{a['title']} {a['snippet']}" for a in articles[:100]]
         vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
         tfidf_matrix = vectorizer.fit_transform(texts)
@@ -126,21 +206,6 @@ def cluster_similar_articles(articles, n_clusters=5):
         return []
 
 
-def prioritize_world_articles(articles):
-    """Place World category articles at the front while preserving recency/trending"""
-    try:
-        world = [a for a in articles if a.get('category') == 'World']
-        others = [a for a in articles if a.get('category') != 'World']
-
-        # Sort world by trending_score then published
-        world.sort(key=lambda x: (-(x.get('trending_score', 0)), x.get('published')), reverse=False)
-
-        # Keep others as-is (already sorted by published desc)
-        return world + others
-    except Exception as e:
-        logger.debug(f"Error prioritizing world articles: {e}")
-        return articles
-
 def calculate_trending_score(article):
     """Calculate trending score"""
     try:
@@ -257,6 +322,8 @@ def resolve_url(url, base=None):
 def extract_image_from_html(html_text, base_url=None):
     """Extract image from HTML"""
     try:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(html_text, "html.parser")
         
         og_img = soup.find("meta", property="og:image")
@@ -388,15 +455,259 @@ def clean_text(text):
     if not text:
         return ""
     try:
+        from bs4 import BeautifulSoup
+
         soup = BeautifulSoup(text, "html.parser")
         clean = soup.get_text().strip()
         return clean[:300] + "..." if len(clean) > 300 else clean
     except:
         return str(text)[:300]
 
+class CappedStream:
+    """File-like reader over a streamed response that stops after max_bytes"""
+
+    def __init__(self, response, max_bytes=None):
+        self.chunks = response.iter_content(chunk_size=FEED_CHUNK_SIZE)
+        self.max_bytes = max_bytes or FEED_MAX_BYTES
+        self.bytes_read = 0
+        self.truncated = False
+        self.exhausted = False
+        self.pending = b""
+        # Raw bytes read so far (bounded by max_bytes), so a document lxml
+        # cannot handle can still be handed to feedparser
+        self.buffer = bytearray()
+
+    def read(self, size=-1):
+        while not self.pending:
+            if self.exhausted:
+                return b""
+            if self.bytes_read >= self.max_bytes:
+                self.truncated = True
+                self.exhausted = True
+                return b""
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.exhausted = True
+                return b""
+            if not chunk:
+                continue
+            room = self.max_bytes - self.bytes_read
+            if len(chunk) > room:
+                chunk = chunk[:room]
+                self.truncated = True
+            self.bytes_read += len(chunk)
+            self.buffer.extend(chunk)
+            self.pending = chunk
+
+        if size is None or size < 0:
+            data, self.pending = self.pending, b""
+        else:
+            data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+    def drain(self):
+        """Read the rest of the stream (up to the byte cap) and return everything read"""
+        while self.read(FEED_CHUNK_SIZE):
+            pass
+        return bytes(self.buffer)
+
+
+class UndeclaredEntityError(Exception):
+    """Raised when a feed uses HTML named entities (&rsquo;, &nbsp;, ...) that XML does not define"""
+
+
+@functools.lru_cache(maxsize=None)
+def feed_date_parser():
+    """feedparser's date parser, imported once on first use.
+
+    _parse_date is private to feedparser (pinned at 6.0.10 in requirements.txt);
+    using it keeps *_parsed fields identical to what feedparser.parse produces,
+    so check it still exists when upgrading feedparser.
+    """
+    from feedparser.datetimes import _parse_date
+    return _parse_date
+
+
+def element_text(elem):
+    """Text of an element, serializing inline XHTML children when present"""
+    if len(elem):
+        text = (elem.text or "") + "".join(
+            etree.tostring(child, encoding="unicode", method="html") for child in elem
+        )
+    else:
+        text = elem.text or ""
+    return text.strip()[:FEED_MAX_FIELD_CHARS]
+
+
+def element_to_entry(elem):
+    """Convert an RSS <item> or Atom <entry> element into a feedparser-style dict"""
+    entry = {"links": []}
+    media_content = []
+    media_thumbnail = []
+    enclosures = []
+    children = list(elem)
+
+    while children:
+        child = children.pop(0)
+        if not isinstance(child.tag, str):
+            continue
+        qname = etree.QName(child)
+        name = qname.localname.lower()
+
+        if qname.namespace == MEDIA_NS and name not in ("group", "content", "thumbnail"):
+            # media:title / media:description etc. must not shadow the item fields
+            continue
+        if name == "group":
+            # media:group wraps media:content / media:thumbnail
+            children.extend(child)
+        elif name == "title":
+            entry["title"] = element_text(child)
+        elif name == "link":
+            href = child.get("href")
+            if href:
+                rel = child.get("rel", "alternate")
+                entry["links"].append({"href": href, "rel": rel, "type": child.get("type", "")})
+                if rel == "alternate" and not entry.get("link"):
+                    entry["link"] = href
+            elif child.text and not entry.get("link"):
+                entry["link"] = child.text.strip()
+        elif name in ("description", "summary"):
+            entry.setdefault("summary", element_text(child))
+        elif name in ("encoded", "content") and child.get("url") is None:
+            entry["content"] = [{"value": element_text(child)}]
+        elif name == "content":
+            media_content.append(dict(child.attrib))
+        elif name == "thumbnail":
+            media_thumbnail.append(dict(child.attrib))
+        elif name == "enclosure":
+            enclosure = {"href": child.get("url", ""), "type": child.get("type", "")}
+            enclosures.append(enclosure)
+            entry["links"].append(dict(enclosure, rel="enclosure"))
+        elif name in ("pubdate", "published", "issued") or (name == "date" and "published" not in entry):
+            entry["published"] = (child.text or "").strip()
+        elif name in ("updated", "modified"):
+            entry["updated"] = (child.text or "").strip()
+        elif name in ("guid", "id"):
+            entry["id"] = (child.text or "").strip()
+
+    # Like feedparser, fall back to the full content when there is no summary
+    if "summary" not in entry and entry.get("content"):
+        entry["summary"] = entry["content"][0]["value"]
+    if not entry.get("link") and entry.get("id", "").startswith("http"):
+        entry["link"] = entry["id"]
+    if media_content:
+        entry["media_content"] = media_content
+    if media_thumbnail:
+        entry["media_thumbnail"] = media_thumbnail
+    if enclosures:
+        entry["enclosures"] = enclosures
+    for field in ("published", "updated"):
+        if entry.get(field):
+            parsed = feed_date_parser()(entry[field])
+            if parsed:
+                entry[f"{field}_parsed"] = parsed
+
+    return entry
+
+
+def iter_feed_entries(stream):
+    """Incrementally yield entries from an RSS/Atom byte stream, freeing parsed elements"""
+    context = etree.iterparse(
+        stream,
+        events=("end",),
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+        remove_comments=True,
+    )
+    for _, elem in context:
+        if not isinstance(elem.tag, str):
+            continue
+        if etree.QName(elem).localname not in ("item", "entry"):
+            continue
+
+        # In recover mode lxml silently drops undeclared entities (and mangles
+        # the text around them); the error is logged by the time the entry
+        # that contains it ends, so nothing corrupted is ever yielded
+        for error in context.error_log:
+            if error.type_name.endswith("UNDECLARED_ENTITY"):
+                raise UndeclaredEntityError(error.message)
+
+        yield element_to_entry(elem)
+
+        # Drop the element and everything before it so memory stays flat
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def stream_feed_entries(response, source_name):
+    """Yield entries from a streamed feed response, falling back to feedparser
+    when lxml finds none or the feed uses HTML named entities"""
+    stream = CappedStream(response)
+    yielded = 0
+    fallback = False
+    try:
+        for entry in iter_feed_entries(stream):
+            yielded += 1
+            yield entry
+    except UndeclaredEntityError as e:
+        logger.debug(f"Streaming parse of {source_name} hit {e}, continuing with feedparser")
+        fallback = True
+    except etree.LxmlError as e:
+        logger.debug(f"Streaming parse stopped for {source_name}: {e}")
+
+    if stream.truncated:
+        logger.warning(f"✂️ {source_name}: feed truncated at {stream.bytes_read // 1024} KB")
+
+    if fallback or yielded == 0:
+        import feedparser
+
+        # Entries already yielded were parsed cleanly; continue after them
+        parsed_feed = feedparser.parse(stream.drain())
+        for entry in parsed_feed.entries[yielded:]:
+            yield entry
+
+
+def build_article(entry, title, link, source_key, source_info, category):
+    """Build an article dict from a parsed feed entry"""
+    snippet = clean_text(entry.get("summary", entry.get("description", "")))
+
+    return {
+        "id": generate_article_id(title, link),
+        "title": title,
+        "link": link,
+        "snippet": snippet,
+        "image": extract_image_from_entry(entry, link),
+        "source": source_info["name"],
+        "source_key": source_key,
+        "source_logo": source_info["logo"],
+        "category": category,
+        "tier": source_info.get("tier", "free"),
+        "published": parse_published_date(entry),
+        "fetched_at": datetime.datetime.now(),
+        "sentiment": analyze_sentiment(title + " " + snippet),
+        "trending_score": 0
+    }
+
+
+def carry_over_articles(articles):
+    """Copy previously fetched articles with their trending score brought up to date"""
+    carried = []
+    for article in articles:
+        article = dict(article)
+        article["trending_score"] = calculate_trending_score(article)
+        carried.append(article)
+    return carried
+
+
 def fetch_single_feed(source_key, source_info, category, limit=None):
     """Fetch articles from RSS feed"""
     articles = []
+    response = None
     try:
         # Limit lightweight fallback page fetches per feed to avoid long blocking
         fallback_attempts = 0
@@ -408,14 +719,17 @@ def fetch_single_feed(source_key, source_info, category, limit=None):
 
         # Simple retry/backoff to improve reliability
         attempt = 0
-        response = None
         while attempt < 2:
             try:
-                response = requests.get(feed_url, headers=headers, timeout=15, allow_redirects=True)
+                response = requests.get(feed_url, headers=headers, timeout=15, allow_redirects=True, stream=STREAMING_PARSE)
                 response.raise_for_status()
                 break
             except requests.exceptions.RequestException as e:
                 attempt += 1
+                # A streamed error response still holds its connection
+                if response is not None:
+                    response.close()
+                response = None
                 logger.warning(f"Attempt {attempt} failed for {source_info['name']}: {e}")
                 time.sleep(1 * attempt)
 
@@ -423,15 +737,32 @@ def fetch_single_feed(source_key, source_info, category, limit=None):
             logger.error(f"Failed to fetch feed for {source_info['name']} after retries")
             return articles
 
-        parsed_feed = feedparser.parse(response.content)
+        if STREAMING_PARSE:
+            entries = stream_feed_entries(response, source_info['name'])
+            max_entries = min(limit, FEED_MAX_ENTRIES) if limit is not None else FEED_MAX_ENTRIES
+            previous = FEED_STATE.get(source_key, {"articles": [], "exhausted": False})
+        else:
+            import feedparser
 
-        if not parsed_feed.entries:
-            logger.warning(f"No entries for {source_info['name']}")
-            return articles
+            parsed_feed = feedparser.parse(response.content)
+
+            if not parsed_feed.entries:
+                logger.warning(f"No entries for {source_info['name']}")
+                return articles
 
-        logger.info(f"✓ {source_info['name']}: {len(parsed_feed.entries)} entries")
+            logger.info(f"✓ {source_info['name']}: {len(parsed_feed.entries)} entries")
 
-        entries = parsed_feed.entries if limit is None else parsed_feed.entries[:limit]
+            entries = parsed_feed.entries if limit is None else parsed_feed.entries[:limit]
+            max_entries = len(entries)
+            previous = {"articles": [], "exhausted": False}
+
+        previous_index = {a["id"]: i for i, a in enumerate(previous["articles"])}
+        reused = 0
+        exhausted = True
+        if max_entries <= 0:
+            entries, exhausted = [], False
+        # The limit is checked as soon as an article is added so that no
+        # further entry is read from the stream once we have enough
         for entry in entries:
             try:
                 title = entry.get("title", "No Title")
@@ -439,25 +770,34 @@ def fetch_single_feed(source_key, source_info, category, limit=None):
                 
                 if not link or not title:
                     continue
-                
-                snippet = clean_text(entry.get("summary", entry.get("description", "")))
-                
-                article = {
-                    "id": generate_article_id(title, link),
-                    "title": title,
-                    "link": link,
-                    "snippet": snippet,
-                    "image": extract_image_from_entry(entry, link),
-                    "source": source_info["name"],
-                    "source_key": source_key,
-                    "source_logo": source_info["logo"],
-                    "category": category,
-                    "tier": source_info.get("tier", "free"),
-                    "published": parse_published_date(entry),
-                    "fetched_at": datetime.datetime.now(),
-                    "sentiment": analyze_sentiment(title + " " + snippet),
-                    "trending_score": 0
-                }
+
+                # Reaching the newest article of the last fetch means the feed
+                # only gained items at the top, so the rest is unchanged. A
+                # match further down may have new items around it (feeds
+                # ordered by editorial priority), so keep parsing then.
+                article_id = generate_article_id(title, link)
+                if article_id in previous_index:
+                    index = previous_index[article_id]
+                    if index == 0:
+                        # Skip articles already reused from higher up this feed
+                        seen = {a["id"] for a in articles}
+                        remaining = [a for a in previous["articles"] if a["id"] not in seen]
+                        wanted = max_entries - len(articles)
+                        if previous["exhausted"] or len(remaining) >= wanted:
+                            carried = carry_over_articles(remaining[:wanted])
+                            reused += len(carried)
+                            articles.extend(carried)
+                            exhausted = previous["exhausted"] and len(remaining) <= wanted
+                            break
+                    # Only this entry can be reused
+                    articles.extend(carry_over_articles([previous["articles"][index]]))
+                    reused += 1
+                    if len(articles) >= max_entries:
+                        exhausted = False
+                        break
+                    continue
+
+                article = build_article(entry, title, link, source_key, source_info, category)
 
                 # If image missing, do a lightweight page fetch fallback but only for high-value sources
                 # and limit number of fallbacks per feed to avoid long-running fetches that cause executor timeouts.
@@ -477,10 +817,20 @@ def fetch_single_feed(source_key, source_info, category, limit=None):
 
                 article["trending_score"] = calculate_trending_score(article)
                 articles.append(article)
+                if len(articles) >= max_entries:
+                    exhausted = False
+                    break
                 
             except Exception as e:
                 logger.debug(f"Error parsing entry: {e}")
                 continue
+
+        if STREAMING_PARSE:
+            if not articles:
+                logger.warning(f"No entries for {source_info['name']}")
+            else:
+                logger.info(f"✓ {source_info['name']}: {len(articles)} entries ({reused} unchanged)")
+                FEED_STATE[source_key] = {"articles": articles, "exhausted": exhausted}
                 
     except requests.exceptions.Timeout:
         logger.error(f"⏱️ Timeout: {source_info['name']}")
@@ -488,21 +838,373 @@ def fetch_single_feed(source_key, source_info, category, limit=None):
         logger.error(f"❌ Error: {source_info['name']}: {e}")
     except Exception as e:
         logger.error(f"❌ Unexpected error: {source_info['name']}: {e}")
+    finally:
+        # Closing a streamed response stops reading the rest of the body
+        if response is not None:
+            response.close()
     
     return articles
 
-def aggregate_all_news(max_per_source=None, use_cache=True):
+def source_rank(article):
+    """Position of the article's source in NEWS_SOURCES; earlier sources win duplicates"""
+    return SOURCE_RANK.get(article["source_key"], len(SOURCE_RANK))
+
+
+def by_published(article):
+    # With reverse=True: newest first, then earlier sources first
+    return (article["published"], -source_rank(article))
+
+
+def by_trending(article):
+    # With reverse=True: highest score first, then as by_published
+    return (article["trending_score"], article["published"], -source_rank(article))
+
+
+def world_order(article):
+    """Sort key for World articles: highest trending score first, then oldest, then earlier sources"""
+    return (-(article.get('trending_score', 0)), article.get('published'), source_rank(article))
+
+
+def merge_sorted(current, batch, key, reverse=True):
+    """Merge an already sorted batch into an already sorted list, returning a new list"""
+    if not batch:
+        return current
+    return list(heapq.merge(current, batch, key=key, reverse=reverse))
+
+
+def build_snapshot(feeds, trending_limit=TRENDING_LIMIT):
+    """Build every snapshot view in one pass over the k-way merge of per-feed article lists.
+
+    Each feed is ordered newest first (a no-op sort for feeds that already are),
+    the feeds are merged lazily with heapq.merge and duplicates are dropped as
+    they stream past, so the cost is O(n log k) for n articles from k feeds.
+    A duplicate is kept from the first source in NEWS_SOURCES order that has
+    it, whatever order the feeds are given in. Trending is a bounded min-heap
+    instead of a full sort.
+    """
+    feeds = sorted((articles for articles in feeds if articles), key=lambda articles: source_rank(articles[0]))
+    owners = {}
+    for articles in feeds:
+        for article in articles:
+            owners.setdefault(article["id"], article)
+    runs = [sorted(articles, key=by_published, reverse=True) for articles in feeds]
+
+    by_date = []
+    world = []
+    others = []
+    front = []
+    by_category = defaultdict(list)
+    by_source = defaultdict(list)
+    trending_heap = []
+
+    for article in heapq.merge(*runs, key=by_published, reverse=True):
+        if owners[article["id"]] is not article:
+            continue
+        position = len(by_date)
+        by_date.append(article)
+
+        category = article.get('category')
+        if category == 'World':
+            world.append(article)
+        else:
+            others.append(article)
+        if category in FRONT_CATEGORIES:
+            front.append(article)
+        by_category[article["category"]].append(article)
+        by_source[article["source"]].append(article)
+
+        # Min-heap of the best trending_limit scores; on equal scores the
+        # later article is evicted first, matching a stable sort
+        entry = (by_trending(article), -position, article)
+        if len(trending_heap) < trending_limit:
+            heapq.heappush(trending_heap, entry)
+        elif entry[:2] > trending_heap[0][:2]:
+            heapq.heapreplace(trending_heap, entry)
+
+    # World articles lead all_articles, highest trending score first
+    world.sort(key=world_order)
+    trending = [entry[2] for entry in sorted(trending_heap, key=lambda e: e[:2], reverse=True)]
+
+    return {
+        "by_date": by_date,
+        "world": world,
+        "others": others,
+        "front": front,
+        "by_category": by_category,
+        "by_source": by_source,
+        "trending": trending,
+    }
+
+
+class ProgressiveSnapshot:
+    """Snapshot views maintained incrementally as each feed finishes.
+
+    Every list is kept in its final order and replaced (never mutated) on
+    merge, so a published snapshot stays consistent for readers while the
+    next one is built.
+    """
+
+    def __init__(self, feeds=None):
+        # Latest articles per source_key, including copies another source owns,
+        # so a duplicate can pass to the next source when its owner drops it
+        self.feeds = dict(feeds or {})
+        self.holders = defaultdict(dict)
+        for source_key, articles in self.feeds.items():
+            self.hold(source_key, articles)
+        views = build_snapshot(self.feeds.values())
+
+        self.by_date = views["by_date"]
+        self.world = views["world"]
+        self.others = views["others"]
+        self.front = views["front"]
+        self.by_category = views["by_category"]
+        self.by_source = views["by_source"]
+        self.trending = views["trending"]
+        self.owned = {a["id"]: a for a in self.by_date}
+        self.refreshed_sources = set()
+        self.successful_fetches = 0
+        self.failed_fetches = 0
+        self.failed_sources = set()
+
+    def hold(self, source_key, articles):
+        for article in articles:
+            self.holders[article["id"]].setdefault(source_key, article)
+
+    def release(self, source_key, articles):
+        for article in articles:
+            holders = self.holders.get(article["id"])
+            if holders:
+                holders.pop(source_key, None)
+                if not holders:
+                    del self.holders[article["id"]]
+
+    def owner(self, article_id):
+        """The copy from the earliest source in NEWS_SOURCES that has the article"""
+        holders = self.holders.get(article_id)
+        if not holders:
+            return None
+        return holders[min(holders, key=lambda key: SOURCE_RANK.get(key, len(SOURCE_RANK)))]
+
+    def merge(self, source_key, source_name, articles):
+        """Merge one feed's fresh articles into the snapshot.
+
+        An empty result (failed or empty feed) drops the source's previous
+        articles.
+        """
+        self.refreshed_sources.add(source_key)
+        if articles:
+            self.successful_fetches += 1
+        else:
+            self.fail(source_name)
+
+        previous = self.feeds.pop(source_key, [])
+        self.release(source_key, previous)
+        if articles:
+            self.feeds[source_key] = articles
+            self.hold(source_key, articles)
+
+        # Only articles this source had or has can change owner
+        removed = set()
+        added = []
+        for article_id in dict.fromkeys([a["id"] for a in articles] + [a["id"] for a in previous]):
+            current = self.owned.get(article_id)
+            owner = self.owner(article_id)
+            if current is owner:
+                continue
+            if current is not None:
+                removed.add(article_id)
+            if owner is not None:
+                self.owned[article_id] = owner
+                added.append(owner)
+            else:
+                del self.owned[article_id]
+
+        self.replace(removed, added)
+
+    def replace(self, removed, added):
+        """Drop the current copies of removed ids and merge the added articles in"""
+        trending_hit = any(a["id"] in removed for a in self.trending)
+        if removed:
+            def keep(articles):
+                return [a for a in articles if a["id"] not in removed]
+
+            self.by_date = keep(self.by_date)
+            self.world = keep(self.world)
+            self.others = keep(self.others)
+            self.front = keep(self.front)
+            for views in (self.by_category, self.by_source):
+                for key, articles in list(views.items()):
+                    remaining = keep(articles)
+                    if remaining:
+                        views[key] = remaining
+                    else:
+                        del views[key]
+
+        batch = sorted(added, key=by_published, reverse=True)
+        self.by_date = merge_sorted(self.by_date, batch, by_published)
+        self.world = merge_sorted(self.world, sorted((a for a in batch if a.get('category') == 'World'), key=world_order), world_order, reverse=False)
+        self.others = merge_sorted(self.others, [a for a in batch if a.get('category') != 'World'], by_published)
+        self.front = merge_sorted(self.front, [a for a in batch if a.get('category') in FRONT_CATEGORIES], by_published)
+        for views, field in ((self.by_category, "category"), (self.by_source, "source")):
+            grouped = defaultdict(list)
+            for article in batch:
+                grouped[article[field]].append(article)
+            for key, group in grouped.items():
+                views[key] = merge_sorted(views.get(key, []), group, by_published)
+        if trending_hit:
+            self.trending = heapq.nlargest(TRENDING_LIMIT, self.by_date, key=by_trending)
+        else:
+            self.trending = heapq.nlargest(TRENDING_LIMIT, self.trending + batch, key=by_trending)
+
+    def fail(self, source_name):
+        self.failed_fetches += 1
+        self.failed_sources.add(source_name)
+
+    def publish(self, clusters=None):
+        """Swap the current views into CACHE"""
+        all_articles = self.world + self.others
+        total_fetches = self.successful_fetches + self.failed_fetches
+        snapshot = {
+            "all_articles": all_articles,
+            "by_category": dict(self.by_category),
+            "by_source": dict(self.by_source),
+            "trending": self.trending,
+            "front_page": self.front,
+            "fetched_at": time.time(),
+            "failed_sources": sorted(self.failed_sources),
+            "stats": {
+                "total_articles": len(all_articles),
+                "categories": len(self.by_category),
+                "sources": len(self.by_source),
+                "trending_count": len(self.trending),
+                "clusters": len(clusters if clusters is not None else CACHE.get("clusters", [])),
+                "last_updated": datetime.datetime.now().isoformat(),
+                "successful_fetches": self.successful_fetches,
+                "failed_fetches": self.failed_fetches,
+                "success_rate": f"{(self.successful_fetches/total_fetches*100):.1f}%" if total_fetches > 0 else "0%"
+            }
+        }
+        if clusters is not None:
+            snapshot["clusters"] = clusters
+        snapshot["version"] = CACHE["version"] + 1
+        # A single dict.update keeps readers from seeing a half-swapped snapshot
+        CACHE.update(snapshot)
+        schedule_page_render()
+        return all_articles
+
+
+def aggregate_progressively(max_per_source=None):
+    """Fetch all feeds, publishing a merged snapshot as each feed completes"""
+    logger.info("🔄 Fetching fresh articles (progressive)...")
+    started = time.time()
+    # Start from the previous articles so sources that miss the deadline keep
+    # theirs, with trending scores brought up to date
+    seed = {
+        source_key: carry_over_articles(feed["articles"])
+        for source_key, feed in LATEST_FEEDS.items()
+        if started - feed["fetched_at"] < STRAGGLER_MAX_AGE
+    }
+    snapshot = ProgressiveSnapshot(seed)
+    sources = {}
+
+    def finished(future, source_key):
+        with FETCHING_LOCK:
+            FETCHING_SOURCES.discard(source_key)
+
+    executor = ThreadPoolExecutor(max_workers=15)
+    try:
+        futures = {}
+        for category, category_sources in NEWS_SOURCES.items():
+            for source_key, source_info in category_sources.items():
+                sources[source_key] = source_info['name']
+                # A fetch left running by an earlier refresh is not started again
+                with FETCHING_LOCK:
+                    if source_key in FETCHING_SOURCES:
+                        continue
+                    FETCHING_SOURCES.add(source_key)
+                future = executor.submit(
+                    fetch_single_feed,
+                    source_key,
+                    source_info,
+                    category,
+                    max_per_source
+                )
+                # Also runs when the future is cancelled at shutdown
+                future.add_done_callback(lambda future, source_key=source_key: finished(future, source_key))
+                futures[future] = (source_key, source_info['name'])
+
+        try:
+            for future in as_completed(futures, timeout=REFRESH_DEADLINE):
+                source_key, source_name = futures[future]
+                try:
+                    articles = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Error processing {source_name}: {e}")
+                    articles = []
+                snapshot.merge(source_key, source_name, articles)
+                snapshot.publish()
+        except FuturesTimeoutError:
+            logger.warning(f"⏱️ Refresh deadline ({REFRESH_DEADLINE}s) reached")
+    finally:
+        # Do not wait for stragglers; their FEED_STATE still updates when they finish
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    stragglers = [name for key, name in sources.items() if key not in snapshot.refreshed_sources]
+    if stragglers:
+        logger.warning(f"⏱️ Deferring {len(stragglers)} sources still fetching to next cycle")
+        for source_name in stragglers:
+            snapshot.fail(source_name)
+
+    # Stragglers keep their original fetch time so their articles age out
+    fetched_at = time.time()
+    latest = {
+        source_key: LATEST_FEEDS[source_key]
+        for source_key in snapshot.feeds
+        if source_key not in snapshot.refreshed_sources
+    }
+    for source_key in snapshot.refreshed_sources:
+        if source_key in snapshot.feeds:
+            latest[source_key] = {"articles": snapshot.feeds[source_key], "fetched_at": fetched_at}
+    LATEST_FEEDS.clear()
+    LATEST_FEEDS.update(latest)
+
+    # Clustering is the expensive step, so it runs once on the final snapshot
+    unique_articles = snapshot.world + snapshot.others
+    unique_articles = snapshot.publish(clusters=cluster_similar_articles(unique_articles))
+
+    logger.info(f"✓ Published {len(unique_articles)} unique articles from {snapshot.successful_fetches} sources in {time.time() - started:.1f}s")
+
+    return unique_articles
+
+def aggregate_all_news(max_per_source=None, use_cache=True, max_waiters=None):
     """Aggregate all news"""
     now = time.time()
     
     if use_cache and CACHE["all_articles"] and (now - CACHE["fetched_at"] < CACHE_TTL):
         logger.info("✓ Returning cached articles")
         return CACHE["all_articles"]
+
+    # While the background boot fetch runs, serve what it has published so far
+    # instead of starting a second full fetch
+    if use_cache and BOOT["initial_fetch"] == "running":
+        return CACHE["all_articles"]
+
+    # Concurrent callers share one fetch instead of each refetching every feed
+    return INFLIGHT.do(
+        ("refresh", max_per_source),
+        lambda: fetch_all_news(max_per_source),
+        max_waiters=max_waiters
+    )
+
+def fetch_all_news(max_per_source=None):
+    """Fetch every feed and publish a new snapshot"""
+    now = time.time()
+
+    if PROGRESSIVE_PUBLISH:
+        return aggregate_progressively(max_per_source)
     
     logger.info("🔄 Fetching fresh articles...")
-    all_articles = []
-    articles_by_category = defaultdict(list)
-    articles_by_source = defaultdict(list)
+    feed_results = {}
     failed_sources_set = set()
 
     successful_fetches = 0
@@ -520,18 +1222,14 @@ def aggregate_all_news(max_per_source=None, use_cache=True):
                     category, 
                     max_per_source
                 )
-                futures.append((future, source_info['name']))
+                futures.append((future, source_key, source_info['name']))
         
-        for future, source_name in futures:
+        for future, source_key, source_name in futures:
             try:
                 articles = future.result(timeout=20)
                 if articles:
-                    all_articles.extend(articles)
+                    feed_results[source_key] = articles
                     successful_fetches += 1
-
-                    for article in articles:
-                        articles_by_category[article["category"]].append(article)
-                        articles_by_source[article["source"]].append(article)
                 else:
                     failed_fetches += 1
                     failed_sources_set.add(source_name)
@@ -540,41 +1238,30 @@ def aggregate_all_news(max_per_source=None, use_cache=True):
                 failed_fetches += 1
                 failed_sources_set.add(source_name)
     
-    # Remove duplicates
-    seen_ids = set()
-    unique_articles = []
-    for article in all_articles:
-        if article["id"] not in seen_ids:
-            seen_ids.add(article["id"])
-            unique_articles.append(article)
-    
-    # Sort by date
-    unique_articles.sort(key=lambda x: x["published"], reverse=True)
-
-    # Prioritize World category for front page
-    unique_articles = prioritize_world_articles(unique_articles)
-
-    trending = sorted(unique_articles, key=lambda x: x["trending_score"], reverse=True)[:30]
+    # Merge, dedupe and build every view in a single pass
+    views = build_snapshot(feed_results.values())
+    LATEST_FEEDS.clear()
+    LATEST_FEEDS.update({
+        source_key: {"articles": articles, "fetched_at": now}
+        for source_key, articles in feed_results.items()
+    })
+    unique_articles = views["world"] + views["others"]
+    trending = views["trending"]
     clusters = cluster_similar_articles(unique_articles)
     
     CACHE["all_articles"] = unique_articles
-    CACHE["by_category"] = dict(articles_by_category)
-    CACHE["by_source"] = dict(articles_by_source)
+    CACHE["by_category"] = dict(views["by_category"])
+    CACHE["by_source"] = dict(views["by_source"])
     CACHE["trending"] = trending
     CACHE["clusters"] = clusters
     # Front page: only World and Politics, newest first
-    try:
-        front = [a for a in unique_articles if a.get('category') in ('World', 'Politics')]
-        front.sort(key=lambda x: x['published'], reverse=True)
-        CACHE['front_page'] = front
-    except Exception as e:
-        logger.debug(f"Error preparing front_page cache: {e}")
+    CACHE['front_page'] = views["front"]
     CACHE["fetched_at"] = now
     CACHE["failed_sources"] = sorted(list(failed_sources_set))
     CACHE["stats"] = {
         "total_articles": len(unique_articles),
-        "categories": len(articles_by_category),
-        "sources": len(articles_by_source),
+        "categories": len(views["by_category"]),
+        "sources": len(views["by_source"]),
         "trending_count": len(trending),
         "clusters": len(clusters),
         "last_updated": datetime.datetime.now().isoformat(),
@@ -582,28 +1269,305 @@ def aggregate_all_news(max_per_source=None, use_cache=True):
         "failed_fetches": failed_fetches,
         "success_rate": f"{(successful_fetches/(successful_fetches+failed_fetches)*100):.1f}%" if (successful_fetches+failed_fetches) > 0 else "0%"
     }
+    CACHE["version"] += 1
+    schedule_page_render()
     
     logger.info(f"✓ Fetched {len(unique_articles)} unique articles from {successful_fetches} sources")
     
     return unique_articles
 
+def warm_up():
+    """Import the heavy analytics modules ahead of their first use"""
+    started = time.time()
+    for module in WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.error(f"❌ Warmup import failed for {module}: {e}")
+    BOOT["warm"] = True
+    logger.info(f"✓ Warmup complete in {time.time() - started:.2f}s")
+
+def initial_fetch():
+    """Fetch the first snapshot, recording progress for the readiness check"""
+    BOOT["initial_fetch"] = "running"
+    try:
+        aggregate_all_news(use_cache=False)
+        # fetch_single_feed swallows its errors, so an outage shows up as an
+        # empty snapshot rather than an exception
+        if not CACHE["all_articles"]:
+            raise RuntimeError("no feed returned any articles")
+        BOOT["initial_fetch"] = "done"
+        logger.info("✓ Initial news fetch complete")
+    except Exception as e:
+        BOOT["initial_fetch"] = "failed"
+        BOOT["failed_at"] = time.time()
+        logger.error(f"❌ Error during initial fetch: {e}")
+
+def start_background_boot():
+    """Run warmup and the initial fetch once without blocking the HTTP server,
+    retrying the fetch if it failed"""
+    with BOOT_LOCK:
+        start_warmup = not BOOT["started"]
+        retry_fetch = (BOOT["initial_fetch"] == "failed"
+                       and time.time() - BOOT["failed_at"] >= BOOT_RETRY_INTERVAL)
+        start_fetch = start_warmup or retry_fetch
+        BOOT["started"] = True
+        if start_fetch:
+            BOOT["initial_fetch"] = "running"
+
+    if start_warmup:
+        threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    if start_fetch:
+        threading.Thread(target=initial_fetch, name="initial-fetch", daemon=True).start()
+
+def is_ready():
+    """Ready once there is a snapshot with articles to serve"""
+    return bool(CACHE["all_articles"])
+
+@app.before_request
+def boot_on_first_request():
+    # Servers that import app (gunicorn, flask run) never reach __main__, so
+    # the first request of any kind, including a health probe, starts the boot
+    if not BOOT["started"] or BOOT["initial_fetch"] == "failed":
+        start_background_boot()
+
+class Overloaded(Exception):
+    """Raised when too many callers are already queued behind an in-flight call"""
+
+
+class InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight computation between concurrent callers with the same key"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn, max_waiters=None):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = InFlightCall()
+            elif max_waiters is not None and call.waiters >= max_waiters:
+                raise Overloaded(key)
+            else:
+                call.waiters += 1
+
+        if not leader:
+            count_admission(f"{key[0]}_coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        with self.lock:
+            return {str(key): call.waiters for key, call in self.calls.items()}
+
+
+class TokenBucket:
+    """Bucket of up to burst tokens refilled continuously at rate tokens/second"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self):
+        """Seconds until a token is available, 0 if one is available now"""
+        self.refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """Token buckets per (client, endpoint), plus one shared bucket per endpoint"""
+
+    def __init__(self, client_limits, endpoint_limits, max_buckets=10000):
+        self.client_limits = client_limits
+        self.endpoint_limits = endpoint_limits
+        self.max_buckets = max_buckets
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def bucket(self, key, limits):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_buckets:
+                self.prune()
+            bucket = self.buckets[key] = TokenBucket(*limits)
+        return bucket
+
+    def prune(self):
+        # A bucket that has refilled completely behaves exactly like a new one
+        now = time.monotonic()
+        for key, bucket in list(self.buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.burst:
+                del self.buckets[key]
+        if len(self.buckets) >= self.max_buckets:
+            self.buckets.clear()
+
+    def check(self, client, endpoint):
+        """Return 0 if the request is admitted, else the seconds to wait"""
+        with self.lock:
+            buckets = [
+                self.bucket(("*", endpoint), self.endpoint_limits[endpoint]),
+                self.bucket((client, endpoint), self.client_limits[endpoint]),
+            ]
+            # Only spend tokens when every bucket admits the request, so a
+            # client is not charged for a request the shared bucket rejected
+            retry_after = max(bucket.wait() for bucket in buckets)
+            if retry_after:
+                return retry_after
+            for bucket in buckets:
+                bucket.take()
+            return 0
+
+
+INFLIGHT = SingleFlight()
+LIMITER = RateLimiter(CLIENT_RATE_LIMITS, ENDPOINT_RATE_LIMITS)
+ADMISSION_STATS = defaultdict(int)
+ADMISSION_LOCK = threading.Lock()
+
+def count_admission(name):
+    with ADMISSION_LOCK:
+        ADMISSION_STATS[name] += 1
+
+def client_id():
+    """Identify the caller, using X-Forwarded-For only when behind a trusted proxy"""
+    if TRUST_PROXY:
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.remote_addr or "unknown"
+
+def too_busy(message, retry_after):
+    response = jsonify({"error": message, "retry_after": math.ceil(retry_after)})
+    response.headers["Retry-After"] = str(math.ceil(retry_after))
+    return response
+
+def rate_limited(endpoint):
+    """Reject requests over the client's or the endpoint's token bucket with 429"""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            count_admission(f"{endpoint}_requests")
+            retry_after = LIMITER.check(client_id(), endpoint)
+            if retry_after:
+                count_admission(f"{endpoint}_rate_limited")
+                return too_busy("Too many requests", retry_after), 429
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def search_articles(query):
+    """All articles whose title or snippet contains query"""
+    articles = aggregate_all_news()
+    return [
+        a for a in articles 
+        if query in a["title"].lower() or query in a["snippet"].lower()
+    ]
+
+# Pre-rendered pages: name -> {"version", "body", "gzip", "etag"}, rebuilt in
+# the background whenever a new snapshot is published
+PAGE_RENDERERS = {
+    "index": lambda: render_template("index.html", front_articles=CACHE.get('front_page', [])[:50]),
+}
+PAGE_CACHE = {}
+RENDER_WAKEUP = threading.Event()
+RENDER_WORKER = {"thread": None}
+RENDER_LOCK = threading.Lock()
+
+def render_page(name, version):
+    """Render a page once and keep its plain and gzip bodies"""
+    with app.app_context():
+        body = PAGE_RENDERERS[name]().encode("utf-8")
+    page = {
+        "version": version,
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=6),
+        "etag": hashlib.sha1(body).hexdigest()[:20]
+    }
+    current = PAGE_CACHE.get(name)
+    if current is None or current["version"] <= version:
+        PAGE_CACHE[name] = page
+    return page
+
+def get_page(name):
+    """Pre-rendered page for the current snapshot, rendering it once on a miss"""
+    version = CACHE["version"]
+    page = PAGE_CACHE.get(name)
+    if page is not None and page["version"] == version:
+        return page
+    return INFLIGHT.do(("render", name, version), lambda: render_page(name, version))
+
+def render_worker():
+    while True:
+        RENDER_WAKEUP.wait()
+        RENDER_WAKEUP.clear()
+        # Progressive publishing swaps snapshots in bursts; render the latest once
+        version = CACHE["version"]
+        for name in PAGE_RENDERERS:
+            try:
+                get_page(name)
+            except Exception as e:
+                logger.error(f"❌ Error pre-rendering {name} for snapshot {version}: {e}")
+
+def schedule_page_render():
+    """Wake the background renderer after a snapshot swap"""
+    with RENDER_LOCK:
+        if RENDER_WORKER["thread"] is None:
+            RENDER_WORKER["thread"] = threading.Thread(target=render_worker, name="page-render", daemon=True)
+            RENDER_WORKER["thread"].start()
+    RENDER_WAKEUP.set()
+
+def send_page(page):
+    """Serve a pre-rendered page, gzipped when accepted, answering 304 on a matching ETag"""
+    use_gzip = request.accept_encodings.quality("gzip") > 0
+    response = Response(page["gzip"] if use_gzip else page["body"], mimetype="text/html")
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = "no-cache"
+    response.set_etag(page["etag"] + ("-gz" if use_gzip else ""))
+    return response.make_conditional(request)
+
 # --- API ROUTES ---
 @app.route("/")
 def index():
     try:
-        # Trigger initial fetch if needed
-        if not CACHE["all_articles"]:
-            aggregate_all_news()
-        # Prepare front page: only World and Politics, newest first
-        try:
-            if not CACHE.get('front_page'):
-                aggregate_all_news()
-            front_articles = CACHE.get('front_page', [])[:50]
-        except Exception:
-            front_articles = []
-
-        # Pass front page articles to template for rendering
-        return render_template("index.html", front_articles=front_articles)
+        # Served from the page cache; fetching is left to the boot thread and
+        # the API routes so the landing page never waits on feeds
+        return send_page(get_page("index"))
     except Exception as e:
         logger.error(f"Error rendering index: {e}")
         return f"Error loading page: {str(e)}", 500
@@ -699,33 +1663,51 @@ def api_stats():
     return jsonify(CACHE.get("stats", {}))
 
 @app.route("/api/search")
+@rate_limited("search")
 def api_search():
     try:
         query = request.args.get("q", "").lower()
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", SEARCH_DEFAULT_PER_PAGE, type=int), 1), SEARCH_MAX_PER_PAGE)
         
         if not query:
             return jsonify({"error": "Query required"}), 400
         
-        articles = aggregate_all_news()
+        results = INFLIGHT.do(("search", query), lambda: search_articles(query))
         
-        results = [
-            a for a in articles 
-            if query in a["title"].lower() or query in a["snippet"].lower()
-        ]
+        start = (page - 1) * per_page
+        end = start + per_page
         
         return jsonify({
-            "results": results,
+            "results": results[start:end],
             "total": len(results),
-            "query": query
+            "query": query,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": (len(results) + per_page - 1) // per_page
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/api/refresh")
+@rate_limited("refresh")
 def api_refresh():
     try:
-        CACHE["fetched_at"] = 0
-        articles = aggregate_all_news(use_cache=False)
+        cache_age = time.time() - CACHE["fetched_at"]
+        if CACHE["all_articles"] and cache_age < REFRESH_MIN_INTERVAL:
+            count_admission("refresh_skipped_fresh")
+            return jsonify({
+                "message": "Already up to date",
+                "total_articles": len(CACHE["all_articles"]),
+                "stats": CACHE.get("stats", {})
+            })
+
+        try:
+            articles = aggregate_all_news(use_cache=False, max_waiters=REFRESH_MAX_WAITERS)
+        except Overloaded:
+            count_admission("refresh_shed")
+            return too_busy("Refresh queue is busy", REFRESH_DEADLINE), 503
+
         return jsonify({
             "message": "Refreshed",
             "total_articles": len(articles),
@@ -738,9 +1720,32 @@ def api_refresh():
 def api_health():
     return jsonify({
         "status": "healthy",
+        "live": True,
+        "ready": is_ready(),
+        "warm": BOOT["warm"],
+        "initial_fetch": BOOT["initial_fetch"],
+        "uptime": time.time() - BOOT["started_at"],
         "cache_age": time.time() - CACHE["fetched_at"],
         "total_articles": len(CACHE["all_articles"]),
-        "failed_sources": CACHE.get("failed_sources", [])
+        "failed_sources": CACHE.get("failed_sources", []),
+        "admission": dict(ADMISSION_STATS),
+        "in_flight": INFLIGHT.in_flight()
+    })
+
+@app.route("/api/health/live")
+def api_health_live():
+    """Liveness: the process is up and serving requests"""
+    return jsonify({"status": "alive"})
+
+@app.route("/api/health/ready")
+def api_health_ready():
+    """Readiness: a news snapshot is available to serve"""
+    if not is_ready():
+        return jsonify({"status": "starting", "initial_fetch": BOOT["initial_fetch"]}), 503
+    return jsonify({
+        "status": "ready",
+        "initial_fetch": BOOT["initial_fetch"],
+        "total_articles": len(CACHE["all_articles"])
     })
 
 @app.route("/debug")
@@ -771,11 +1776,11 @@ if __name__ == "__main__":
     else:
         logger.error(f"❌ Templates folder NOT found")
     
-    try:
-        aggregate_all_news(use_cache=False)
-        logger.info("✓ Initial news fetch complete")
-    except Exception as e:
-        logger.error(f"❌ Error during initial fetch: {e}")
+    if ASYNC_BOOT:
+        start_background_boot()
+    else:
+        BOOT["started"] = True
+        initial_fetch()
     
     port = int(os.environ.get("PORT", 7860))
     app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
\ No newline at end of file
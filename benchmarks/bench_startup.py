@@ -0,0 +1,112 @@
+"""Startup-time benchmark for the news aggregator.
+
+Measures, in fresh interpreter processes:
+  * how long `import app` takes
+  * how long `python app.py` takes to answer /api/health/live (liveness)
+    and /api/health/ready (readiness, i.e. a first snapshot is published)
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--mode async|blocking|both] [--ready-timeout 60]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_import(runs):
+    """Median wall time of `import app` in a fresh interpreter"""
+    samples = []
+    code = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def wait_for(url, deadline):
+    """Poll url until it returns 200, returning the time it did (or None)"""
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as resp:
+                if resp.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def time_server(async_boot, ready_timeout):
+    """Seconds from process start until the server is live and ready"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), ASYNC_BOOT="1" if async_boot else "0")
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "app.py"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = started + ready_timeout
+        base = f"http://127.0.0.1:{port}"
+        live_at = wait_for(f"{base}/api/health/live", deadline)
+        ready_at = wait_for(f"{base}/api/health/ready", deadline) if live_at else None
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    live = live_at - started if live_at else None
+    ready = ready_at - started if ready_at else None
+    return live, ready
+
+
+def fmt(seconds):
+    return f"{seconds:.3f}s" if seconds is not None else "timeout"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=["async", "blocking", "both"], default="async")
+    parser.add_argument("--ready-timeout", type=float, default=60)
+    args = parser.parse_args()
+
+    print(f"import app (median of {args.runs}): {fmt(time_import(args.runs))}")
+
+    modes = ["async", "blocking"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        lives, readies = [], []
+        for _ in range(args.runs):
+            live, ready = time_server(mode == "async", args.ready_timeout)
+            lives.append(live)
+            readies.append(ready)
+        live_ok = [s for s in lives if s is not None]
+        ready_ok = [s for s in readies if s is not None]
+        print(
+            f"{mode:>8} boot: live {fmt(statistics.median(live_ok) if live_ok else None)}, "
+            f"ready {fmt(statistics.median(ready_ok) if ready_ok else None)} "
+            f"({len(ready_ok)}/{args.runs} runs became ready)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@
         let currentView = 'grid';
         let currentPage = 1;
         const articlesPerPage = 50;
+        // Active search: results are fetched from the server a page at a time
+        let searchState = null;
 
         // Initialize
         document.addEventListener('DOMContentLoaded', () => {
@@ -75,6 +77,7 @@
         // Fetch News
         async function fetchNews() {
             try {
+                searchState = null;
                 showLoading();
                 let url = '/api/articles?per_page=500';
                 
@@ -162,6 +165,7 @@
         async function searchNews() {
             const query = document.getElementById('searchInput').value.trim();
             if (!query) {
+                searchState = null;
                 displayedArticles = [...allArticles];
                 renderArticles();
                 return;
@@ -169,16 +173,33 @@
 
             try {
                 showLoading();
-                const response = await fetch(`/api/search?q=${encodeURIComponent(query)}`);
-                const data = await response.json();
-                displayedArticles = data.results || [];
-                document.getElementById('sectionTitle').textContent = `Search: "${query}"`;
+                searchState = { query, page: 0, totalPages: 1, total: 0 };
+                currentPage = 1;
+                displayedArticles = [];
+                await fetchSearchPage(1);
                 renderArticles();
                 hideLoading();
             } catch (error) {
                 console.error('Error searching:', error);
-                showError('Search failed. Please try again.');
+                showError(error.message || 'Search failed. Please try again.');
+            }
+        }
+
+        // Fetch one page of search results and append it
+        async function fetchSearchPage(page) {
+            const query = searchState.query;
+            const response = await fetch(`/api/search?q=${encodeURIComponent(query)}&page=${page}&per_page=${articlesPerPage}`);
+            const data = await response.json().catch(() => ({}));
+            if (!response.ok) {
+                throw new Error(busyMessage(response, data, 'Search failed. Please try again.'));
             }
+
+            displayedArticles = displayedArticles.concat(data.results || []);
+            searchState.page = page;
+            searchState.totalPages = data.total_pages || 0;
+            searchState.total = data.total || 0;
+            document.getElementById('sectionTitle').textContent =
+                `Search: "${query}" (${searchState.total} result${searchState.total === 1 ? '' : 's'})`;
         }
 
         // Render Articles
@@ -347,7 +368,18 @@
         }
 
         // Load More Articles
-        function loadMore() {
+        async function loadMore() {
+            // Searches fetch the next page of results from the server when needed
+            if (searchState && searchState.page < searchState.totalPages
+                && displayedArticles.length < (currentPage + 1) * articlesPerPage) {
+                try {
+                    await fetchSearchPage(searchState.page + 1);
+                } catch (error) {
+                    console.error('Error loading more results:', error);
+                    showNotification(error.message, 'error');
+                    return;
+                }
+            }
             currentPage++;
             renderArticles();
             window.scrollTo({ top: 0, behavior: 'smooth' });
@@ -381,7 +413,14 @@
                 document.getElementById('tierFilter').value = '';
                 document.getElementById('sortFilter').value = 'date';
                 
-                await fetch('/api/refresh');
+                const response = await fetch('/api/refresh');
+                if (!response.ok) {
+                    // Rate limited (429) or refresh queue busy (503)
+                    const data = await response.json().catch(() => ({}));
+                    refreshIcon.style.animation = '';
+                    showNotification(busyMessage(response, data, 'Failed to refresh news.'), 'error');
+                    return;
+                }
                 await fetchNews();
                 
                 refreshIcon.style.animation = '';
@@ -472,6 +511,16 @@
             `;
         }
 
+        // Error text for a rejected request, including the server's Retry-After
+        function busyMessage(response, data, fallback) {
+            let message = (data && data.error) || fallback;
+            const retryAfter = response.headers.get('Retry-After');
+            if (retryAfter) {
+                message += `. Please try again in ${retryAfter}s.`;
+            }
+            return message;
+        }
+
         function showNotification(message, type = 'info') {
             const notification = document.createElement('div');
             notification.style.cssText = `
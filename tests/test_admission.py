@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+from collections import defaultdict
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze time.monotonic so token refills are deterministic"""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(app.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_client_keeps_tokens_when_endpoint_bucket_rejects(clock):
+    limiter = app.RateLimiter({"refresh": (1 / 30, 2)}, {"refresh": (1 / 10, 1)})
+
+    assert limiter.check("a", "refresh") == 0
+    # The shared bucket is empty, so client b is rejected...
+    assert limiter.check("b", "refresh") == pytest.approx(10)
+    assert limiter.check("b", "refresh") == pytest.approx(10)
+
+    # ...but has not lost any of its own tokens meanwhile
+    clock["t"] += 10
+    assert limiter.check("b", "refresh") == 0
+    clock["t"] += 10
+    assert limiter.check("b", "refresh") == 0
+
+
+def test_client_bucket_limits_each_client(clock):
+    limiter = app.RateLimiter({"search": (1, 2)}, {"search": (100, 100)})
+
+    assert [limiter.check("a", "search") for _ in range(3)] == [0, 0, pytest.approx(1)]
+    assert limiter.check("b", "search") == 0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client with fresh admission state and the background boot skipped"""
+    monkeypatch.setitem(app.BOOT, "started", True)
+    monkeypatch.setitem(app.BOOT, "initial_fetch", "done")
+    monkeypatch.setattr(app, "CACHE", dict(app.CACHE, all_articles=[], fetched_at=0))
+    monkeypatch.setattr(app, "LIMITER", app.RateLimiter(app.CLIENT_RATE_LIMITS, app.ENDPOINT_RATE_LIMITS))
+    monkeypatch.setattr(app, "INFLIGHT", app.SingleFlight())
+    monkeypatch.setattr(app, "ADMISSION_STATS", defaultdict(int))
+    return app.app.test_client()
+
+
+def wait_until(condition):
+    deadline = time.time() + 5
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_concurrent_callers_share_one_computation(monkeypatch):
+    monkeypatch.setattr(app, "ADMISSION_STATS", defaultdict(int))
+    flight = app.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return ["result"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(("search", "q"), compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # All but the leader are waiting on the shared call
+    wait_until(lambda: flight.in_flight() == {str(("search", "q")): 4})
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert app.ADMISSION_STATS["search_coalesced"] == 4
+    # The next call after completion computes again
+    assert flight.do(("search", "q"), compute) == ["result"]
+    assert len(calls) == 2
+
+
+def test_refresh_is_shed_with_503_when_queue_is_full(client, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(app, "fetch_all_news", lambda max_per_source=None: release.wait(5) and [])
+    monkeypatch.setattr(app, "REFRESH_MAX_WAITERS", 0)
+    leader = threading.Thread(target=lambda: app.aggregate_all_news(use_cache=False))
+    leader.start()
+    try:
+        wait_until(app.INFLIGHT.in_flight)
+
+        response = client.get("/api/refresh")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(math.ceil(app.REFRESH_DEADLINE))
+        assert app.ADMISSION_STATS["refresh_shed"] == 1
+    finally:
+        release.set()
+        leader.join(5)
+
+
+def test_refresh_returns_fresh_snapshot_without_fetching(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app, "fetch_all_news", lambda max_per_source=None: calls.append(1) or app.CACHE["all_articles"])
+    app.CACHE["all_articles"] = [{"id": "1"}]
+    app.CACHE["fetched_at"] = time.time()
+
+    response = client.get("/api/refresh")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Already up to date"
+    assert calls == []
+    assert app.ADMISSION_STATS["refresh_skipped_fresh"] == 1
+
+    # Once the snapshot is older than the minimum interval a refresh runs
+    app.CACHE["fetched_at"] = time.time() - app.REFRESH_MIN_INTERVAL
+    response = client.get("/api/refresh")
+    assert response.get_json()["message"] == "Refreshed"
+    assert calls == [1]
+
+
+def test_search_caps_page_size(client, monkeypatch):
+    monkeypatch.setattr(app, "search_articles", lambda query: [{"id": str(n)} for n in range(250)])
+
+    data = client.get("/api/search?q=news&per_page=1000").get_json()
+    assert data["per_page"] == app.SEARCH_MAX_PER_PAGE
+    assert len(data["results"]) == app.SEARCH_MAX_PER_PAGE
+    assert data["total"] == 250
+    assert data["total_pages"] == 3
+
+    data = client.get("/api/search?q=news&per_page=1000&page=3").get_json()
+    assert [a["id"] for a in data["results"]] == [str(n) for n in range(200, 250)]
+
+    data = client.get("/api/search?q=news").get_json()
+    assert data["per_page"] == app.SEARCH_DEFAULT_PER_PAGE
+    assert data["total_pages"] == 5
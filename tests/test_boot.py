@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+import app
+
+aggregate_all_news = app.aggregate_all_news
+
+
+@pytest.fixture
+def fresh_boot(monkeypatch):
+    """Reset boot state and replace the warmup and fetch with controllable stand-ins"""
+    monkeypatch.setitem(app.BOOT, "started", False)
+    monkeypatch.setitem(app.BOOT, "warm", False)
+    monkeypatch.setitem(app.BOOT, "initial_fetch", "pending")
+    monkeypatch.setitem(app.BOOT, "failed_at", 0)
+    monkeypatch.setitem(app.CACHE, "all_articles", [])
+    monkeypatch.setattr(app, "warm_up", lambda: None)
+
+    state = {"release": threading.Event(), "calls": 0, "error": None}
+
+    def fake_aggregate(use_cache=True, **kwargs):
+        state["calls"] += 1
+        state["release"].wait(5)
+        if state["error"]:
+            raise state["error"]
+        app.CACHE["all_articles"] = [{"id": "1"}]
+        return app.CACHE["all_articles"]
+
+    monkeypatch.setattr(app, "aggregate_all_news", fake_aggregate)
+    return state
+
+
+def wait_for_fetch(expected):
+    for thread in threading.enumerate():
+        if thread.name == "initial-fetch":
+            thread.join(5)
+    assert app.BOOT["initial_fetch"] == expected
+
+
+def test_first_request_starts_boot_once(fresh_boot):
+    client = app.app.test_client()
+
+    assert client.get("/api/health/ready").status_code == 503
+    assert client.get("/api/health/ready").status_code == 503
+    assert app.BOOT["initial_fetch"] == "running"
+
+    fresh_boot["release"].set()
+    wait_for_fetch("done")
+
+    assert fresh_boot["calls"] == 1
+    assert client.get("/api/health/ready").status_code == 200
+
+
+def test_failed_fetch_is_not_ready_and_retries(fresh_boot, monkeypatch):
+    fresh_boot["error"] = RuntimeError("feeds down")
+    fresh_boot["release"].set()
+    client = app.app.test_client()
+
+    client.get("/api/health/live")
+    wait_for_fetch("failed")
+    assert client.get("/api/health/ready").status_code == 503
+
+    # Retried on a later request once the retry interval has passed
+    fresh_boot["error"] = None
+    monkeypatch.setattr(app, "BOOT_RETRY_INTERVAL", 0)
+    client.get("/api/health/live")
+    wait_for_fetch("done")
+    assert fresh_boot["calls"] == 2
+    assert client.get("/api/health/ready").status_code == 200
+
+
+def test_boot_fails_when_every_feed_fails(fresh_boot, monkeypatch):
+    # Run the real refresh against feeds that all error out
+    monkeypatch.setattr(app, "aggregate_all_news", aggregate_all_news)
+    monkeypatch.setattr(app, "fetch_single_feed", lambda *args: [])
+    monkeypatch.setattr(app, "cluster_similar_articles", lambda articles: [])
+    monkeypatch.setattr(app, "schedule_page_render", lambda: None)
+    monkeypatch.setattr(app, "LATEST_FEEDS", {})
+    monkeypatch.setattr(app, "CACHE", dict(app.CACHE))
+    monkeypatch.setattr(app, "FETCHING_SOURCES", set())
+    client = app.app.test_client()
+
+    client.get("/api/health/live")
+    wait_for_fetch("failed")
+
+    assert app.BOOT["failed_at"] > 0
+    assert client.get("/api/health/ready").status_code == 503
@@ -0,0 +1,310 @@
+import datetime
+
+import feedparser
+import pytest
+import requests
+
+import app
+
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/"
+     xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel>
+  <title>Example World</title>
+  <link>https://example.com/</link>
+  <item>
+    <title>Markets &amp; policy update</title>
+    <link>https://example.com/a/1</link>
+    <description>&lt;p&gt;Central banks &lt;b&gt;hold&lt;/b&gt; rates.&lt;/p&gt;</description>
+    <pubDate>Mon, 01 Jan 2024 10:30:00 GMT</pubDate>
+    <guid isPermaLink="false">id-1</guid>
+    <media:content url="https://example.com/img/1.jpg" medium="image"/>
+  </item>
+  <item>
+    <title>Storm makes landfall</title>
+    <link>https://example.com/a/2</link>
+    <description>Heavy rain expected.</description>
+    <content:encoded><![CDATA[<p><img src="https://example.com/img/2.png"/>Full body</p>]]></content:encoded>
+    <pubDate>Sun, 31 Dec 2023 22:00:00 +0500</pubDate>
+    <media:group>
+      <media:title>Gallery title</media:title>
+      <media:thumbnail url="https://example.com/img/2-thumb.jpg"/>
+    </media:group>
+  </item>
+  <item>
+    <title>Podcast episode</title>
+    <link>https://example.com/a/3</link>
+    <description>Listen now</description>
+    <dc:date>2023-12-30T08:00:00Z</dc:date>
+    <enclosure url="https://example.com/img/3.jpeg" type="image/jpeg" length="1000"/>
+  </item>
+</channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example Atom</title>
+  <entry>
+    <title>Atom entry one</title>
+    <link rel="alternate" href="https://example.org/e/1"/>
+    <link rel="enclosure" type="image/png" href="https://example.org/img/1.png"/>
+    <id>urn:uuid:1</id>
+    <published>2024-02-01T12:00:00Z</published>
+    <updated>2024-02-02T12:00:00Z</updated>
+    <summary>First summary</summary>
+  </entry>
+  <entry>
+    <title>Atom entry two</title>
+    <link href="https://example.org/e/2"/>
+    <id>urn:uuid:2</id>
+    <updated>2024-01-15T09:30:00+02:00</updated>
+    <content type="html">&lt;p&gt;&lt;img src="https://example.org/img/2.jpg"&gt;Body two&lt;/p&gt;</content>
+  </entry>
+</feed>
+"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.net/"><title>RDF</title></channel>
+  <item rdf:about="https://example.net/1">
+    <title>RDF item</title>
+    <link>https://example.net/1</link>
+    <description>RDF description</description>
+    <dc:date>2024-03-01T06:00:00Z</dc:date>
+  </item>
+</rdf:RDF>
+"""
+
+
+ENTITIES = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+<channel>
+  <title>Entities</title>
+  <item>
+    <title>Plain &amp; simple</title>
+    <link>https://example.com/e/1</link>
+    <description>No named entities here</description>
+    <pubDate>Mon, 01 Jan 2024 10:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>It&rsquo;s a &nbsp;test &amp; more</title>
+    <link>https://example.com/e/2</link>
+    <description>Caf&eacute; &mdash; r&eacute;sum&eacute;</description>
+    <pubDate>Mon, 01 Jan 2024 09:00:00 GMT</pubDate>
+  </item>
+  <item>
+    <title>After the entities &lt;b&gt;</title>
+    <link>https://example.com/e/3</link>
+    <description>Still &amp; correct</description>
+    <pubDate>Mon, 01 Jan 2024 08:00:00 GMT</pubDate>
+  </item>
+</channel>
+</rss>
+"""
+
+
+class FakeResponse:
+    """Stands in for a streamed requests response"""
+
+    def __init__(self, data, chunk_size=64, status_code=200):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.status_code = status_code
+        self.bytes_served = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for start in range(0, len(self.data), self.chunk_size):
+            chunk = self.data[start:start + self.chunk_size]
+            self.bytes_served += len(chunk)
+            yield chunk
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
+
+    def close(self):
+        self.closed = True
+
+
+def article_fields(entry):
+    """The fields fetch_single_feed derives from an entry"""
+    link = entry.get("link", "")
+    return {
+        "title": entry.get("title"),
+        "link": link,
+        "snippet": app.clean_text(entry.get("summary", entry.get("description", ""))),
+        "image": app.extract_image_from_entry(entry, link),
+        "published": app.parse_published_date(entry),
+    }
+
+
+@pytest.mark.parametrize("document", [RSS, ATOM, RDF, ENTITIES], ids=["rss", "atom", "rdf", "entities"])
+def test_streaming_parser_matches_feedparser(document):
+    streamed = list(app.stream_feed_entries(FakeResponse(document), "fixture"))
+    expected = feedparser.parse(document).entries
+
+    assert len(streamed) == len(expected)
+    for ours, theirs in zip(streamed, expected):
+        assert article_fields(ours) == article_fields(theirs)
+
+
+def test_named_entities_are_decoded():
+    titles = [e["title"] for e in app.stream_feed_entries(FakeResponse(ENTITIES), "fixture")]
+    assert titles[1] == "It\u2019s a \xa0test & more"
+
+
+def test_media_group_title_does_not_replace_item_title():
+    entries = list(app.stream_feed_entries(FakeResponse(RSS), "fixture"))
+    assert entries[1]["title"] == "Storm makes landfall"
+
+
+def test_invalid_document_falls_back_to_feedparser():
+    document = b"<html><body>Not a feed</body></html>"
+    streamed = list(app.stream_feed_entries(FakeResponse(document), "fixture"))
+    assert streamed == feedparser.parse(document).entries == []
+
+
+def make_feed(count, newest=0):
+    """RSS document with items numbered newest..newest+count-1, newest first"""
+    base = datetime.datetime(2024, 1, 1, 12, 0)
+    items = b"".join(
+        f"""<item><title>Story {n}</title><link>https://example.com/s/{n}</link>
+        <description>Body {n}</description>
+        <pubDate>{(base - datetime.timedelta(hours=n)).strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate></item>""".encode()
+        for n in range(newest, newest + count)
+    )
+    return b"<rss><channel><title>Cutoff</title>" + items + b"</channel></rss>"
+
+
+@pytest.fixture
+def serve_feed(monkeypatch):
+    """Patch requests.get to stream the current document, recording responses"""
+    state = {"document": b"", "responses": []}
+
+    def fake_get(url, **kwargs):
+        response = FakeResponse(state["document"])
+        state["responses"].append(response)
+        return response
+
+    monkeypatch.setattr(app.requests, "get", fake_get)
+    monkeypatch.setattr(app, "STREAMING_PARSE", True)
+    monkeypatch.setattr(app, "FEED_STATE", {})
+    return state
+
+
+SOURCE = {"name": "Cutoff", "feed": "https://example.com/feed", "logo": "CUT"}
+
+
+def test_byte_cap_truncates_stream(monkeypatch):
+    monkeypatch.setattr(app, "FEED_MAX_BYTES", 2000)
+    document = make_feed(50)
+    response = FakeResponse(document)
+    streamed = list(app.stream_feed_entries(response, "fixture"))
+
+    assert response.bytes_served <= 2000 + response.chunk_size
+    assert 0 < len(streamed) < 50
+
+
+def titles(articles):
+    return [a["title"] for a in articles]
+
+
+def test_limit_stops_reading_the_stream(serve_feed, monkeypatch):
+    parsed = []
+    stream_feed_entries = app.stream_feed_entries
+
+    def counting_stream(*args):
+        for entry in stream_feed_entries(*args):
+            parsed.append(entry["title"])
+            yield entry
+
+    monkeypatch.setattr(app, "stream_feed_entries", counting_stream)
+    serve_feed["document"] = make_feed(50)
+    articles = app.fetch_single_feed("cutoff", SOURCE, "World", limit=5)
+
+    response = serve_feed["responses"][-1]
+    assert titles(articles) == [f"Story {n}" for n in range(5)]
+    # No entry past the limit is pulled from the parser
+    assert parsed == titles(articles)
+    assert response.bytes_served < len(serve_feed["document"])
+    assert response.closed
+
+
+def test_known_article_reuses_previous_fetch(serve_feed, monkeypatch):
+    serve_feed["document"] = make_feed(10, newest=2)
+    first = app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    built = []
+    build_article = app.build_article
+    monkeypatch.setattr(app, "build_article", lambda entry, *args: built.append(entry["title"]) or build_article(entry, *args))
+
+    serve_feed["document"] = make_feed(12, newest=0)
+    second = app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    assert titles(second) == [f"Story {n}" for n in range(12)]
+    # Only the two new stories are parsed; the rest comes from the last fetch
+    assert built == ["Story 0", "Story 1"]
+    assert [a["id"] for a in second[2:]] == [a["id"] for a in first]
+    assert second[2] is not first[0]
+
+
+def test_known_article_after_limited_fetch_keeps_reading(serve_feed):
+    serve_feed["document"] = make_feed(10)
+    app.fetch_single_feed("cutoff", SOURCE, "World", limit=3)
+
+    articles = app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    # The limited fetch never saw stories 3..9, so they must not be cut off
+    assert titles(articles) == [f"Story {n}" for n in range(10)]
+
+
+def make_items(numbers):
+    """RSS document with the given story numbers in feed order"""
+    items = b"".join(
+        f"""<item><title>Story {n}</title><link>https://example.com/s/{n}</link>
+        <description>Body {n}</description></item>""".encode()
+        for n in numbers
+    )
+    return b"<rss><channel><title>Priority</title>" + items + b"</channel></rss>"
+
+
+def test_new_item_below_a_known_one_is_parsed(serve_feed, monkeypatch):
+    serve_feed["document"] = make_items([1, 2, 3, 4])
+    app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    built = []
+    build_article = app.build_article
+    monkeypatch.setattr(app, "build_article", lambda entry, *args: built.append(entry["title"]) or build_article(entry, *args))
+
+    # A feed ordered by editorial priority promotes story 3 and inserts story 9
+    serve_feed["document"] = make_items([3, 9, 1, 2, 4])
+    articles = app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    assert titles(articles) == ["Story 3", "Story 9", "Story 1", "Story 2", "Story 4"]
+    assert built == ["Story 9"]
+
+
+def test_zero_limit_reads_nothing(serve_feed):
+    serve_feed["document"] = make_feed(5)
+    assert app.fetch_single_feed("cutoff", SOURCE, "World", limit=0) == []
+    assert serve_feed["responses"][-1].bytes_served == 0
+
+
+def test_failed_response_is_closed_before_retrying(monkeypatch):
+    responses = [FakeResponse(b"", status_code=503), FakeResponse(make_feed(3))]
+    served = list(responses)
+    monkeypatch.setattr(app.requests, "get", lambda url, **kwargs: served.pop(0))
+    monkeypatch.setattr(app.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(app, "STREAMING_PARSE", True)
+    monkeypatch.setattr(app, "FEED_STATE", {})
+
+    articles = app.fetch_single_feed("cutoff", SOURCE, "World")
+
+    assert titles(articles) == ["Story 0", "Story 1", "Story 2"]
+    assert all(response.closed for response in responses)
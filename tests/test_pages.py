@@ -0,0 +1,36 @@
+import gzip
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Keep requests from starting the real background boot
+    monkeypatch.setitem(app.BOOT, "started", True)
+    monkeypatch.setitem(app.BOOT, "initial_fetch", "done")
+    return app.app.test_client()
+
+
+def test_index_is_gzipped_when_accepted(client):
+    response = client.get("/", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert b"NewsHub" in gzip.decompress(response.data)
+
+
+@pytest.mark.parametrize("accept", ["gzip;q=0", "identity", ""])
+def test_index_is_plain_when_gzip_refused(client, accept):
+    response = client.get("/", headers={"Accept-Encoding": accept})
+
+    assert "Content-Encoding" not in response.headers
+    assert b"NewsHub" in response.data
+
+
+def test_index_answers_304_for_matching_etag(client):
+    first = client.get("/", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.data == b""
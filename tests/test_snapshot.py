@@ -0,0 +1,242 @@
+import datetime
+import random
+import threading
+import time
+
+import pytest
+
+import app
+
+
+BASE = datetime.datetime(2024, 1, 1, 12, 0)
+SHARED_FEEDS = {
+    # Dawn, Express Tribune and The News publish one feed under four categories
+    "dawn": ["dawn", "dawn_politics", "dawn_business", "dawn_sport"],
+    "tribune": ["tribune", "tribune_politics", "tribune_business", "tribune_sport"],
+    "thenews": ["thenews", "thenews_politics", "thenews_business", "thenews_sport"],
+}
+SOURCES = {
+    source_key: (category, source_info)
+    for category, sources in app.NEWS_SOURCES.items()
+    for source_key, source_info in sources.items()
+}
+
+
+def make_article(source_key, article_id, minutes_old, score):
+    category, source_info = SOURCES[source_key]
+    return {
+        "id": article_id,
+        "title": f"Story {article_id}",
+        "snippet": "",
+        "source": source_info["name"],
+        "source_key": source_key,
+        "category": category,
+        "published": BASE - datetime.timedelta(minutes=minutes_old),
+        "trending_score": score,
+    }
+
+
+def make_feeds(rng, generation=0, count=8):
+    """One result list per source; shared publishers return the same stories under every key"""
+    feeds = {}
+    shared = {}
+    for feed, keys in SHARED_FEEDS.items():
+        stories = [
+            (f"{feed}-{generation}-{n}", rng.randint(0, 600), round(rng.random() * 100, 3))
+            for n in range(count)
+        ]
+        # Keep one story from the previous generation so ownership carries across refreshes
+        stories.append((f"{feed}-keep", 700, 1.5))
+        for key in keys:
+            shared[key] = stories
+    for source_key in SOURCES:
+        if source_key in shared:
+            stories = shared[source_key]
+        else:
+            stories = [
+                (f"{source_key}-{generation}-{n}", rng.randint(0, 600), round(rng.random() * 100, 3))
+                for n in range(count)
+            ]
+        feeds[source_key] = [make_article(source_key, *story) for story in stories]
+    return feeds
+
+
+def ids(articles):
+    return [a["id"] for a in articles]
+
+
+def views_of(snapshot):
+    return {
+        "by_date": ids(snapshot.by_date),
+        "world": ids(snapshot.world),
+        "others": ids(snapshot.others),
+        "front": ids(snapshot.front),
+        "by_category": {k: ids(v) for k, v in snapshot.by_category.items()},
+        "by_source": {k: ids(v) for k, v in snapshot.by_source.items()},
+        "trending": ids(snapshot.trending),
+        "owners": {a["id"]: a["source_key"] for a in snapshot.by_date},
+    }
+
+
+def expected_views(feeds):
+    views = app.build_snapshot(list(feeds.values()))
+    return {
+        "by_date": ids(views["by_date"]),
+        "world": ids(views["world"]),
+        "others": ids(views["others"]),
+        "front": ids(views["front"]),
+        "by_category": {k: ids(v) for k, v in views["by_category"].items()},
+        "by_source": {k: ids(v) for k, v in views["by_source"].items()},
+        "trending": ids(views["trending"]),
+        "owners": {a["id"]: a["source_key"] for a in views["by_date"]},
+    }
+
+
+def merge_all(snapshot, feeds, order):
+    for source_key in order:
+        snapshot.merge(source_key, SOURCES[source_key][1]["name"], feeds[source_key])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_progressive_merge_matches_build_snapshot_in_any_order(seed):
+    rng = random.Random(seed)
+    feeds = make_feeds(rng)
+    order = list(feeds)
+    rng.shuffle(order)
+
+    snapshot = app.ProgressiveSnapshot()
+    merge_all(snapshot, feeds, order)
+
+    assert views_of(snapshot) == expected_views(feeds)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_progressive_refresh_matches_build_snapshot(seed):
+    rng = random.Random(seed)
+    previous = make_feeds(rng, generation=0)
+    fresh = make_feeds(rng, generation=1)
+    order = list(fresh)
+    rng.shuffle(order)
+    # Some sources miss the deadline and keep their previous articles
+    finished = order[:-5]
+
+    snapshot = app.ProgressiveSnapshot(previous)
+    merge_all(snapshot, fresh, finished)
+
+    expected = dict(previous)
+    expected.update({key: fresh[key] for key in finished})
+    assert views_of(snapshot) == expected_views(expected)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_progressive_refresh_drops_sources_that_return_nothing(seed):
+    rng = random.Random(seed)
+    previous = make_feeds(rng, generation=0)
+    fresh = make_feeds(rng, generation=1)
+    order = list(fresh)
+    rng.shuffle(order)
+    empty = set(order[:5])
+
+    snapshot = app.ProgressiveSnapshot(previous)
+    for source_key in order:
+        articles = [] if source_key in empty else fresh[source_key]
+        snapshot.merge(source_key, SOURCES[source_key][1]["name"], articles)
+
+    expected = {key: articles for key, articles in fresh.items() if key not in empty}
+    assert views_of(snapshot) == expected_views(expected)
+    assert snapshot.failed_fetches == len(empty)
+
+
+def test_shared_publisher_articles_stay_in_world():
+    rng = random.Random(0)
+    feeds = make_feeds(rng)
+    order = list(reversed(list(feeds)))
+
+    snapshot = app.ProgressiveSnapshot()
+    merge_all(snapshot, feeds, order)
+    for _ in range(3):
+        snapshot = app.ProgressiveSnapshot(snapshot.feeds)
+        merge_all(snapshot, make_feeds(rng), order)
+
+    dawn = [a for a in snapshot.by_date if a["source"] == "Dawn"]
+    assert dawn and all(a["category"] == "World" for a in dawn)
+    assert {a["id"] for a in dawn} <= {a["id"] for a in snapshot.front}
+
+
+# Sources that publish under a single key, so their articles have one owner
+SINGLE_SOURCES = [key for key in SOURCES if not any(key in keys for keys in SHARED_FEEDS.values())]
+
+
+@pytest.fixture
+def refresh(monkeypatch):
+    """Run aggregate_progressively against fake feeds; slow sources block until released"""
+    state = {"results": {}, "slow": set(), "calls": [], "release": threading.Event()}
+
+    def fake_fetch(source_key, source_info, category, limit=None):
+        state["calls"].append(source_key)
+        if source_key in state["slow"]:
+            state["release"].wait(5)
+        return state["results"].get(source_key, [])
+
+    monkeypatch.setattr(app, "fetch_single_feed", fake_fetch)
+    monkeypatch.setattr(app, "cluster_similar_articles", lambda articles: [])
+    monkeypatch.setattr(app, "schedule_page_render", lambda: None)
+    monkeypatch.setattr(app, "REFRESH_DEADLINE", 0.3)
+    monkeypatch.setattr(app, "LATEST_FEEDS", {})
+    monkeypatch.setattr(app, "CACHE", dict(app.CACHE))
+    monkeypatch.setattr(app, "FETCHING_SOURCES", set())
+    yield state
+    # Let blocked fetches finish before the next test replaces FETCHING_SOURCES
+    state["release"].set()
+    deadline = time.time() + 5
+    while app.FETCHING_SOURCES and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_refresh_keeps_only_recent_straggler_articles(refresh, monkeypatch):
+    rng = random.Random(0)
+    previous = make_feeds(rng, generation=0)
+    slow, expired, empty = SINGLE_SOURCES[:3]
+    now = time.time()
+    for source_key, articles in previous.items():
+        app.LATEST_FEEDS[source_key] = {"articles": articles, "fetched_at": now - 60}
+    app.LATEST_FEEDS[expired]["fetched_at"] = now - app.STRAGGLER_MAX_AGE - 1
+
+    fresh = make_feeds(rng, generation=1)
+    refresh["results"] = {key: articles for key, articles in fresh.items() if key != empty}
+    refresh["slow"] = {slow, expired}
+    monkeypatch.setattr(app, "calculate_trending_score", lambda article: 42.0)
+
+    app.aggregate_progressively()
+
+    published = {}
+    for article in app.CACHE["all_articles"]:
+        published.setdefault(article["source_key"], []).append(article)
+    # The straggler keeps its previous articles, rescored, and its fetch time
+    assert sorted(ids(published[slow])) == sorted(ids(previous[slow]))
+    assert all(a["trending_score"] == 42.0 for a in published[slow])
+    assert app.LATEST_FEEDS[slow]["fetched_at"] == now - 60
+    # Too old to keep, or the source answered with nothing
+    for source_key in (expired, empty):
+        assert source_key not in published
+        assert source_key not in app.LATEST_FEEDS
+    assert sorted(ids(published[SINGLE_SOURCES[3]])) == sorted(ids(fresh[SINGLE_SOURCES[3]]))
+
+
+def test_straggler_is_not_fetched_again_while_running(refresh):
+    slow = SINGLE_SOURCES[0]
+    refresh["slow"] = {slow}
+
+    app.aggregate_progressively()
+    app.aggregate_progressively()
+    assert refresh["calls"].count(slow) == 1
+    assert slow in app.FETCHING_SOURCES
+
+    refresh["release"].set()
+    deadline = time.time() + 5
+    while app.FETCHING_SOURCES and time.time() < deadline:
+        time.sleep(0.01)
+    assert not app.FETCHING_SOURCES
+
+    app.aggregate_progressively()
+    assert refresh["calls"].count(slow) == 2